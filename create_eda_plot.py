@@ -0,0 +1,244 @@
+'''
+Plots the EDA traces exported from the wristbands, with the labeled
+slope/flat sections of each session marked on the figure.
+
+The recordings live in a tree of `eda.csv` files, one per session, whose
+rows are `timestamp_micros,eda` pairs sampled at 64 Hz.
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import functools
+import os
+from pathlib import Path
+
+from zoneinfo import ZoneInfo
+
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
+import matplotlib.pyplot as plt
+import numpy as np
+
+TIMEZONE = ZoneInfo('America/Chicago')
+
+
+@functools.lru_cache(maxsize=None)
+def process_path(path: Path) -> tuple[str, str, str]:
+    '''
+    Extracts the (participant, date, session) components that identify a
+    recording from its csv path.
+
+    :param path: The path to a `eda.csv` file.
+    '''
+    # one C-level rsplit on the string; Path.parts re-parses the whole path
+    # through pathlib's normalization machinery on every access
+    parts = os.fspath(path).rsplit(os.sep, 4)
+    return parts[-4], parts[-3], parts[-2]
+
+
+def _scan_csvs(directory) -> list[Path]:
+    '''
+    Recursively finds every `eda.csv` file under the given directory.
+
+    Uses os.scandir rather than os.walk so directory entries keep their
+    cached type information instead of costing one stat() each.
+
+    :param directory: The directory to search.
+    '''
+    csvs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                csvs.extend(_scan_csvs(entry.path))
+            elif entry.name == 'eda.csv':
+                csvs.append(Path(entry.path))
+    return csvs
+
+
+def get_csvs(start_dir) -> list[Path]:
+    '''
+    Finds every `eda.csv` file under the given directory.
+
+    The top-level subdirectories (one per date or participant) are scanned
+    concurrently, which hides I/O latency on large or networked trees.
+
+    :param start_dir: The directory to search.
+    '''
+    subdirs = []
+    csvs = []
+    with os.scandir(start_dir) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name == 'eda.csv':
+                csvs.append(Path(entry.path))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for found in executor.map(_scan_csvs, subdirs):
+            csvs.extend(found)
+    return csvs
+
+
+def get_timestamps(csvs: list[Path]) -> dict[tuple[str, str, str], tuple[datetime, datetime]]:
+    '''
+    Finds the first and last sample time of each recording.
+
+    :param csvs: The `eda.csv` paths to inspect.
+    '''
+    timestamps = {}
+    for path in csvs:
+        # only the two endpoint rows matter, so read the line after the
+        # header and a tail window near EOF rather than parsing every row
+        with open(path, 'rb') as file:
+            file.readline()
+            first_line = file.readline()
+            file.seek(0, os.SEEK_END)
+            file.seek(max(0, file.tell() - 8192))
+            tail = file.read().splitlines()
+            last_line = next(line for line in reversed(tail) if line)
+
+        # stay in integer microseconds: dividing the raw timestamps as floats
+        # both costs a division and rounds in the low digits
+        first_micros = int(first_line.split(b',', 1)[0])
+        last_micros = int(last_line.split(b',', 1)[0])
+
+        first_datetime = datetime.fromtimestamp(first_micros // 1_000_000, TIMEZONE) \
+            + timedelta(microseconds=first_micros % 1_000_000)
+        last_datetime = datetime.fromtimestamp(last_micros // 1_000_000, TIMEZONE) \
+            + timedelta(microseconds=last_micros % 1_000_000)
+        timestamps[process_path(path)] = (first_datetime, last_datetime)
+    return timestamps
+
+
+def get_boundaries(csvs: list[Path]) -> list[tuple[tuple[str, str], int, int]]:
+    '''
+    Finds the ((participant, session), start, end) boundaries of each
+    recording, in microseconds.
+
+    :param csvs: The `eda.csv` paths to inspect.
+    '''
+    boundaries = []
+    for path in csvs:
+        # same endpoint trick as get_timestamps: only the first and last rows
+        # matter, so materializing every row through csv.reader wasted O(N)
+        # time and memory per file
+        with open(path, 'rb') as file:
+            file.readline()
+            first_line = file.readline()
+            file.seek(0, os.SEEK_END)
+            file.seek(max(0, file.tell() - 8192))
+            tail = file.read().splitlines()
+            last_line = next(line for line in reversed(tail) if line)
+
+        participant, _, session = process_path(path)
+        boundaries.append((
+            (participant, session),
+            int(first_line.split(b',', 1)[0]),
+            int(last_line.split(b',', 1)[0]),
+        ))
+    return boundaries
+
+
+def slope_flat_bounds(boundaries: list[tuple[tuple[str, str], int, int]]) -> dict[str, tuple[int, int]]:
+    '''
+    Computes the overall [start, end] range covered by the slope sections and
+    by the flat sections, in microseconds.
+
+    :param boundaries: The per-recording boundaries from `get_boundaries`.
+    '''
+    slope = [(b[1], b[2]) for b in boundaries if b[0][1].startswith('s')]
+    flat = [(b[1], b[2]) for b in boundaries if b[0][1].startswith('f')]
+    return {
+        'slope': (
+            min((start for start, _ in slope), default=None),
+            max((end for _, end in slope), default=None),
+        ),
+        'flat': (
+            min((start for start, _ in flat), default=None),
+            max((end for _, end in flat), default=None),
+        ),
+    }
+
+
+# traces longer than this get decimated before rendering; screens only have
+# a couple thousand horizontal pixels, so denser input is invisible anyway
+_MAX_PLOT_POINTS = 4000
+
+
+def _downsample_indices(length: int, n_out: int = 2000) -> np.ndarray:
+    '''
+    Picks evenly strided sample indices for plotting a long trace.
+
+    :param length: The number of samples in the trace.
+    :param n_out: The approximate number of samples to keep.
+    '''
+    return np.arange(0, length, length // n_out)
+
+
+def plot_eda(data, labeled_regions):
+    '''
+    Plots one or more EDA traces with labeled sample-index regions.
+
+    :param data: A list of (values, color, label) series to plot.
+    :param labeled_regions: A list of (label, start, end) regions to mark,
+    where start and end are sample indices into the traces.
+    '''
+    ax = plt.gca()
+
+    # draw every trace through a single LineCollection: one C-level render
+    # pass instead of a fresh Line2D pipeline (and autoscale) per series
+    segments = []
+    for to_plot, _, _ in data:
+        to_plot = np.asarray(to_plot)
+        if len(to_plot) > _MAX_PLOT_POINTS:
+            indices = _downsample_indices(len(to_plot))
+            segments.append(np.column_stack([indices, to_plot[indices]]))
+        else:
+            segments.append(np.column_stack([np.arange(len(to_plot)), to_plot]))
+    colors = [color for _, color, _ in data]
+    ax.add_collection(LineCollection(segments, colors=colors, linewidths=0.5))
+    handles = [Line2D([], [], color=color, label=label) for _, color, label in data]
+    ax.autoscale()
+
+    # resolve the lower data limit once; plt.ylim() queries the current axes
+    # on every call, which adds up over many regions
+    y0 = ax.get_ylim()[0]
+    for region in labeled_regions:
+        label, start, end = region
+        ax.axvspan(start, end, color='gray', alpha=0.2)
+        ax.text((start + end) / 2, y0, label, ha='center')
+        ax.text(start, y0, str(start), rotation=90, fontsize=6)
+        ax.text(end, y0, str(end), rotation=90, fontsize=6)
+
+    ax.legend(handles=handles)
+
+
+def _demo():
+    '''
+    Plots one day's trace with the slope/flat section bounds marked.
+    '''
+    # one parse for both columns; loading them with two loadtxt calls read
+    # and tokenized the whole file twice
+    samples = np.loadtxt('./EDA/2023-09-22/eda.csv', delimiter=',', skiprows=1,
+                         usecols=(0, 1))
+    eda_values = samples[:, 1]
+    first_micros = int(samples[0, 0])
+    first_datetime = datetime.fromtimestamp(first_micros // 1_000_000, TIMEZONE) \
+        + timedelta(microseconds=first_micros % 1_000_000)
+    print(f'trace starts at {first_datetime}')
+
+    csvs = get_csvs('./EDA')
+    print(get_timestamps(csvs))
+
+    bounds = slope_flat_bounds(get_boundaries(csvs))
+    regions = [
+        (name, (start - first_micros) * 64 // 1_000_000, (end - first_micros) * 64 // 1_000_000)
+        for name, (start, end) in bounds.items()
+        if start is not None
+    ]
+    plot_eda([(eda_values, 'tab:blue', 'EDA')], regions)
+    plt.show()
+
+
+if __name__ == '__main__':
+    _demo()
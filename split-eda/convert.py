@@ -0,0 +1,129 @@
+'''
+Converts the hand-labeled interval files for the EDA sessions into JSON.
+
+The annotation files come in two layouts (see `format_1` and `format_2`); both
+are small comma- or tab-separated text files written while reviewing the
+session recordings. The resulting JSON is consumed by the plotting scripts.
+'''
+
+import argparse
+from collections.abc import Iterator
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# The group orders are fixed by the annotation layouts; build them once at
+# import instead of rebuilding a fresh list on every format_* call.
+_ORDER_1 = tuple(
+    (kind, ground, trial)
+    for kind in ('single-view', 'multi-view')
+    for ground in ('slope', 'flat')
+    for trial in (1, 2, 3)
+)
+_ORDER_2 = tuple(
+    (kind, ground, trial)
+    for kind in ('single-view', 'multi-view')
+    for ground in ('slope', 'flat')
+    for trial in (1, 2, 3, 4, 5)
+)
+
+# The meta skeleton is fully determined by the group order, so build the
+# nested dicts once and share them across records; the encoders only read
+# them, so sharing is safe.
+_META_1 = [
+    {'path': {'kind': kind, 'ground': ground, 'trial': trial}}
+    for kind, ground, trial in _ORDER_1
+]
+_META_2 = [
+    {'path': {'kind': kind, 'ground': ground, 'trial': trial}}
+    for kind, ground, trial in _ORDER_2
+]
+
+
+def _parse_pair(line: str) -> tuple[str | None, str | None]:
+    '''
+    Extracts the (start, end) cells of an interval line in a single pass,
+    normalizing empty cells to None.
+
+    Splitting, padding, and empty-cell normalization happen here in one go,
+    without intermediate lists or extra call frames per line.
+
+    :param line: The interval line to parse.
+    '''
+    start, _, rest = line.replace('\t', ',').partition(',')
+    end = rest.partition(',')[0]
+    return (start or None, end or None)
+
+
+def format_1(lines: list[str]) -> Iterator[dict]:
+    '''
+    Parses the first annotation layout, yielding one record per group.
+
+    Each group spans five lines: a header naming the recording, the pickup,
+    obstacle, and dump intervals, then a blank separator line.
+
+    :param lines: The annotation file contents, one entry per line.
+    '''
+    for i in range(0, len(_ORDER_1) * 5, 5):
+        yield {
+            'meta': _META_1[i // 5],
+            'pickup': _parse_pair(lines[i + 1]),
+            'obstacle': _parse_pair(lines[i + 2]),
+            'dump': _parse_pair(lines[i + 3]),
+        }
+
+
+def format_2(lines: list[str]) -> Iterator[dict]:
+    '''
+    Parses the second annotation layout, yielding one record per group.
+
+    Each group spans ten lines: a header naming the recording, the pickup,
+    obstacle, and dump intervals, then six per-trial rows.
+
+    :param lines: The annotation file contents, one entry per line.
+    '''
+    for i in range(0, len(_ORDER_2) * 10, 10):
+        trials = [_parse_pair(line) for line in lines[i + 4:i + 10]]
+        yield {
+            'meta': _META_2[i // 10],
+            'pickup': _parse_pair(lines[i + 1]),
+            'obstacle': _parse_pair(lines[i + 2]),
+            'dump': _parse_pair(lines[i + 3]),
+            'trials': trials,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert an EDA annotation file to JSON.')
+    parser.add_argument('infile', type=argparse.FileType('r'))
+    parser.add_argument('outfile', type=argparse.FileType('wb'))
+    parser.add_argument('--format', type=int, choices=(1, 2), default=1,
+                        help='which annotation layout the input uses')
+    args = parser.parse_args()
+
+    lines = [line.rstrip('\n') for line in args.infile]
+    records = format_1(lines) if args.format == 1 else format_2(lines)
+
+    if orjson is not None:
+        # orjson's encoder is much faster than the stdlib pretty-printer and
+        # serializes tuples as arrays, matching the stdlib output; it already
+        # produces UTF-8 bytes, so a binary outfile skips the re-encode pass
+        dump = lambda record: orjson.dumps(record, option=orjson.OPT_INDENT_2)
+    else:
+        dump = lambda record: json.dumps(record, indent=2).encode()
+
+    # stream one record at a time instead of materializing the full output
+    # list and walking it a second time inside the encoder
+    args.outfile.write(b'[\n')
+    for i, record in enumerate(records):
+        if i:
+            args.outfile.write(b',\n')
+        args.outfile.write(dump(record))
+    args.outfile.write(b'\n]\n')
+
+
+if __name__ == '__main__':
+    main()
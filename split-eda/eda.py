@@ -0,0 +1,314 @@
+'''
+Loading, chunking, and analysis of the EDA session recordings.
+
+The recordings live in a tree of `eda.csv` files, one per
+participant/date/session, whose rows are `timestamp_micros,eda` pairs. An
+`Eda` object wraps the raw reference trace plus the per-group recordings and
+can be narrowed to the groups matching a wildcard pattern via `chunk`.
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import functools
+import os
+from pathlib import Path
+
+import neurokit2 as nk
+import numpy as np
+import pandas as pd
+
+from eda_common import (
+    filter_by_timestamp_bounds,
+    get_min_max_micros_many,
+    get_min_max_timestamps,
+    micros_to_datetime,
+)
+from eda_pre_process import pre_process_raw_eda
+
+
+def read_samples(eda_path) -> np.ndarray:
+    '''
+    Parses one `eda.csv` into an (N, 2) float64 array of
+    (timestamp_micros, eda) samples.
+
+    pandas' C engine tokenizes and converts the whole file in native code,
+    several times faster than np.loadtxt's per-line conversion on these
+    multi-MB dumps, and to_numpy() hands back the same contiguous float64
+    array the callers already expect.
+
+    :param eda_path: The path to the csv file.
+    '''
+    return pd.read_csv(
+        eda_path, usecols=[0, 1], dtype=np.float64, engine='c',
+    ).to_numpy()
+
+
+def _compile_component(pattern: str):
+    '''
+    Builds a matcher for one group-pattern component.
+
+    The patterns are only ever literals or `prefix*suffix`, so plain
+    startswith/endswith tests cover them without dragging in the regex
+    machinery.
+
+    :param pattern: The component pattern to compile.
+    '''
+    star = pattern.find('*')
+    if star == -1:
+        return pattern.__eq__
+    prefix = pattern[:star]
+    suffix = pattern[star + 1:]
+    min_len = len(prefix) + len(suffix)
+
+    def match(s: str) -> bool:
+        return len(s) >= min_len and s.startswith(prefix) and s.endswith(suffix)
+    return match
+
+
+def _find_csvs(directory):
+    '''
+    Recursively yields every `eda.csv` path under the given directory.
+
+    os.scandir keeps the file type cached on each DirEntry, where os.walk
+    stringifies every name and re-stats directories along the way.
+
+    :param directory: The directory to search.
+    '''
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _find_csvs(entry.path)
+            elif entry.name == 'eda.csv':
+                yield Path(entry.path)
+
+
+def process_group_file(eda_path) -> tuple[tuple[str, str, str], np.ndarray]:
+    '''
+    Reads only the first and last samples of a group's `eda.csv`.
+
+    The per-group recordings only ever contribute their time endpoints (the
+    trace that gets analyzed is the raw reference one), so parsing every row
+    of a multi-million-row file wastes O(N) time and memory for two values.
+    Read the line after the header and scan a small tail window instead.
+
+    :param eda_path: The path to the csv file.
+    '''
+    with open(eda_path, 'rb') as file:
+        file.readline()
+        first = file.readline()
+        file.seek(0, os.SEEK_END)
+        file.seek(max(0, file.tell() - 512))
+        tail = file.read().splitlines()
+        last = next(line for line in reversed(tail) if line)
+
+    first_row = first.split(b',')
+    last_row = last.split(b',')
+    parts = Path(eda_path).parts
+    endpoints = np.array([
+        [float(first_row[0]), float(first_row[1])],
+        [float(last_row[0]), float(last_row[1])],
+    ])
+    # chunk() shares these arrays by reference across every derived Eda
+    # instead of copying them; freeze them so an accidental write upstream
+    # cannot silently corrupt all the sharers
+    endpoints.setflags(write=False)
+    return (parts[-4], parts[-3], parts[-2]), endpoints
+
+
+class Eda:
+    '''
+    A set of EDA recordings: the raw reference trace plus the per-group
+    session recordings.
+    '''
+
+    def __init__(self, raw, data: dict[tuple[str, str, str], np.ndarray]):
+        self.raw = np.asarray(raw)
+        # contiguous SoA columns alongside the (N, 2) rows: every consumer
+        # wants one column at a time (diff and filtering want timestamps,
+        # NeuroKit wants eda), and the strided column views of the row
+        # array defeat vectorized loads. The signal column goes to float32
+        # like the per-chunk columns do — conductance has a tiny dynamic
+        # range, and halving its bytes halves the memory traffic of every
+        # downstream pass; the timestamps keep float64 for microsecond
+        # precision, which is why the file is parsed as float64 rows rather
+        # than read at mixed precision.
+        self.raw_ts = np.ascontiguousarray(self.raw[:, 0])
+        self.raw_eda = np.ascontiguousarray(self.raw[:, 1], dtype=np.float32)
+        self.raw_chunks = pre_process_raw_eda(self.raw)
+        self.data = data
+        self._pattern_cache: dict[tuple[str, str, str], tuple] = {}
+        self._chunk_cache: dict[tuple[str, str, str], 'Eda'] = {}
+
+    @functools.cached_property
+    def analyzed_data(self):
+        '''
+        The per-chunk NeuroKit analysis of the raw trace.
+
+        Computed lazily on first access: chunk() builds intermediate Eda
+        objects whose analysis would otherwise run eagerly in __init__ only
+        to be thrown away. Each chunk is processed on its own — batching
+        chunks through one nk.eda_process call filtered across the gap
+        seams and split SCR events (and their onset/peak pairing) across
+        slice boundaries, so the per-chunk results were not just slower or
+        faster but wrong near every boundary.
+        '''
+        return [
+            nk.eda_process(chunk.eda, sampling_rate=chunk.sampling_rate)
+            for chunk in self.raw_chunks
+        ]
+
+    @classmethod
+    def from_dir(cls, start_dir, raw_path) -> 'Eda':
+        '''
+        Loads every `eda.csv` under the given directory, plus the raw
+        reference trace.
+
+        :param start_dir: The directory containing the per-session trees.
+        :param raw_path: The path to the raw reference `eda.csv`.
+        '''
+        # the raw reference trace lives under start_dir too; drop it from the
+        # group list so its file is not read a second time below
+        raw_resolved = Path(raw_path).resolve()
+        paths = [
+            path
+            for path in _find_csvs(start_dir)
+            if path.resolve() != raw_resolved
+        ]
+
+        # the files are independent, so fan the reads out; threads are the
+        # right pool here since the workers spend their time blocked on I/O
+        # (and pandas' C parser releases the GIL anyway), without the fork
+        # and pickling cost a process pool pays per file
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            data = dict(executor.map(process_group_file, paths))
+
+        raw = read_samples(raw_path)
+        return cls(raw, data)
+
+    def get_raw_min_max_timestamps(self) -> tuple[datetime, datetime]:
+        '''
+        Returns the first and last sample time of the raw trace.
+
+        Display-facing: this is one of the two places a datetime gets
+        built. Comparisons and reductions happen on raw microseconds.
+        '''
+        return get_min_max_timestamps(self.raw)
+
+    @functools.cached_property
+    def _min_max_micros(self) -> tuple[int, int]:
+        '''
+        The time range covered by the per-group recordings, in microseconds.
+
+        Cached because the drivers ask for the same bounds repeatedly (the
+        suptitle of every figure drawn from a chunk, both annotation
+        layouts back to back) and nothing mutates the group data after
+        construction, so the O(groups) reduction only needs to run once
+        per instance.
+        '''
+        return get_min_max_micros_many(self.data)
+
+    def get_min_max_timestamps(self) -> tuple[datetime, datetime]:
+        '''
+        Returns the time range covered by the per-group recordings.
+
+        Display-facing: the extrema are reduced as raw microseconds and
+        only the two winners become datetimes.
+        '''
+        low, high = self._min_max_micros
+        return micros_to_datetime(low), micros_to_datetime(high)
+
+    def get_min_max_micros(self) -> tuple[int, int]:
+        '''
+        Returns the time range covered by the per-group recordings, in
+        microseconds.
+        '''
+        return self._min_max_micros
+
+    def chunk(self, group_pattern: tuple[str, str, str]) -> 'Eda':
+        '''
+        Returns a new Eda restricted to the groups matching the pattern, with
+        the raw trace cut down to the matched time range.
+
+        :param group_pattern: One wildcard pattern per group key component.
+        '''
+        # the driver chunks the same handful of patterns once per annotation
+        # record, and nothing mutates an Eda after construction, so the
+        # derived instances can simply be remembered per pattern
+        cached = self._chunk_cache.get(group_pattern)
+        if cached is not None:
+            return cached
+
+        # share the group data by reference: nothing downstream mutates it,
+        # and the slice-copies duplicated every matched recording per call
+        if group_pattern == ('*', '*', '*'):
+            # the all-wildcard pattern matches every group by construction
+            result = dict(self.data)
+        else:
+            # compile each component pattern once per distinct pattern tuple;
+            # re-slicing the prefixes/suffixes per (group, pattern) pair
+            # was pure Python overhead on a hot call. Literal
+            # components are tested before wildcarded ones so mismatches
+            # short-circuit early, and lone-'*' components are dropped
+            # outright since they match anything.
+            matchers = self._pattern_cache.get(group_pattern)
+            if matchers is None:
+                order = sorted(
+                    (i for i, part in enumerate(group_pattern) if part != '*'),
+                    key=lambda i: '*' in group_pattern[i],
+                )
+                matchers = tuple(
+                    (i, _compile_component(group_pattern[i]))
+                    for i in order
+                )
+                self._pattern_cache[group_pattern] = matchers
+
+            result = {}
+            for group, data in self.data.items():
+                if all(match(group[i]) for i, match in matchers):
+                    result[group] = data
+
+        # name the pattern here, where it is known; the reduction below
+        # only sees the recordings dict
+        if not result:
+            raise ValueError(f'no recordings match pattern {group_pattern!r}')
+
+        # the bounds stay in integer microseconds the whole way through the
+        # filter; datetimes only exist at the presentation boundary
+        new_data_bounds = get_min_max_micros_many(result)
+        new_raw = filter_by_timestamp_bounds(self.raw, new_data_bounds)
+        chunked = Eda(new_raw, result)
+        self._chunk_cache[group_pattern] = chunked
+        return chunked
+
+
+if __name__ == '__main__':
+    out = Eda.from_dir(
+        './Data-Post-Processing',
+        './Data-Post-Processing/raw/eda.csv',
+    )
+
+    # report the sample-gap statistics of the raw trace; each statistic is a
+    # single NumPy reduction over the diff array rather than the two
+    # interpreted passes (one of them recomputing every diff) this used to do
+    diffs = np.diff(out.raw_ts)
+    print(f'gap min={diffs.min()} max={diffs.max()} avg={diffs.mean()} std={diffs.std()}')
+
+    # reference the start of the raw trace as plain microseconds; converting
+    # through timezone-aware datetimes and subtracting them per interval
+    # endpoint was pure overhead
+    ref_micros = out.raw_ts[0]
+
+    def to_secs(micros: int) -> float:
+        '''
+        Converts a microsecond timestamp to seconds since the start of the
+        raw trace.
+        '''
+        return (micros - ref_micros) / 1e6
+
+    slope_bounds = out.chunk(('*', '*', 's*')).get_min_max_micros()
+    flat_bounds = out.chunk(('*', '*', 'f*')).get_min_max_micros()
+    intervals = [
+        (to_secs(slope_bounds[0]), to_secs(slope_bounds[1]), 'Slope'),
+        (to_secs(flat_bounds[0]), to_secs(flat_bounds[1]), 'Flat'),
+    ]
+    print(intervals)
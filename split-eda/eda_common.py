@@ -0,0 +1,116 @@
+'''
+Helpers shared by the EDA loading and plotting scripts.
+
+These used to be copied between scripts, which meant every matching or
+timestamp optimization had to be applied several times over; they live here
+once now so a single change covers every caller.
+'''
+
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# stdlib zoneinfo makes timezone-aware fromtimestamp noticeably cheaper than
+# pytz's localization machinery, and this constant sits on every hot
+# timestamp-conversion path
+TIMEZONE = ZoneInfo('America/Chicago')
+
+
+def micros_to_datetime(micros: int) -> datetime:
+    '''
+    Converts a microsecond timestamp to a timezone-aware datetime.
+
+    This only runs at the presentation boundary — all internal arithmetic
+    stays on int64 microseconds — so the one conversion per displayed value
+    may as well be exact: integer div/mod instead of the float-seconds
+    detour, which rounds in the microsecond digits.
+
+    :param micros: The timestamp to convert.
+    '''
+    return datetime.fromtimestamp(micros // 1_000_000, TIMEZONE) \
+        + timedelta(microseconds=micros % 1_000_000)
+
+
+def filter_by_timestamp_bounds(data, bounds: tuple[int, int]):
+    '''
+    Keeps the samples whose timestamps fall within [bounds[0], bounds[1]].
+
+    :param data: The (timestamp_micros, eda) samples to filter, sorted by
+    timestamp (they come from a monotonic sensor stream).
+    :param bounds: The inclusive bounds, in microseconds.
+    '''
+    # the trace is time-sorted, so two binary searches locate the bounds in
+    # O(log N) where the boolean mask compared every sample, and the slice
+    # is a view instead of a fresh array
+    lower, upper = bounds
+    arr = np.asarray(data)
+    ts = arr[:, 0]
+    start = np.searchsorted(ts, lower, 'left')
+    end = np.searchsorted(ts, upper, 'right')
+    return arr[start:end]
+
+
+if numba is not None:
+    @numba.njit(cache=True, parallel=True)
+    def _minmax_endpoints(endpoints):
+        '''
+        Reduces a (G, 2) array of (first, last) timestamps to the overall
+        (earliest first, latest last) pair.
+
+        :param endpoints: One (first, last) row per recording.
+        '''
+        earliest = endpoints[0, 0]
+        latest = endpoints[0, 1]
+        for i in numba.prange(endpoints.shape[0]):
+            earliest = min(earliest, endpoints[i, 0])
+            latest = max(latest, endpoints[i, 1])
+        return earliest, latest
+
+
+def get_min_max_timestamps(data) -> tuple[datetime, datetime]:
+    '''
+    Returns the first and last sample time of a time-sorted recording.
+
+    :param data: The (timestamp_micros, eda) samples.
+    '''
+    return micros_to_datetime(int(data[0][0])), micros_to_datetime(int(data[-1][0]))
+
+
+def get_min_max_micros_many(data: dict) -> tuple[int, int]:
+    '''
+    Returns the earliest first-sample time and latest last-sample time across
+    a dict of recordings, in microseconds.
+
+    Everything internal works in integer microseconds; datetime objects are
+    only built at the presentation boundary.
+
+    :param data: The per-group recordings.
+    '''
+    # fail with a clear message rather than letting the empty dict surface
+    # as a bare ValueError from min() or a numba typing error on a
+    # zero-length endpoints array
+    if not data:
+        raise ValueError('no recordings to reduce')
+    if numba is None:
+        # builtin min/max run their loops at C level; without a jitted
+        # kernel to feed there is no point gathering an endpoints array
+        return (
+            int(min(group_data[0][0] for group_data in data.values())),
+            int(max(group_data[-1][0] for group_data in data.values())),
+        )
+
+    # gather the (first, last) endpoints into one array and reduce in the
+    # jitted kernel
+    endpoints = np.array([
+        [group_data[0][0], group_data[-1][0]]
+        for group_data in data.values()
+    ])
+    earliest_micros, latest_micros = _minmax_endpoints(endpoints)
+    return int(earliest_micros), int(latest_micros)
+
@@ -0,0 +1,107 @@
+'''
+Figure construction for analyzed EDA sessions.
+
+One figure, three stacked subplots sharing the time axis: the raw signal,
+the phasic component with the SCR onset/peak/half-recovery markers, and the
+tonic component.
+'''
+
+from datetime import datetime
+import functools
+
+from matplotlib.ticker import FuncFormatter
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+@functools.lru_cache(maxsize=512)
+def _format_seconds(seconds: int) -> str:
+    '''
+    Formats a whole-second timestamp as a wall-clock tick label.
+
+    :param seconds: The timestamp to format.
+    '''
+    return datetime.fromtimestamp(seconds).strftime('%H:%M:%S')
+
+
+def _clean_indices(values) -> np.ndarray:
+    '''
+    Drops the NaN padding from a NeuroKit SCR index array and casts it to
+    integer indices.
+
+    :param values: The SCR feature indices, NaN-padded.
+    '''
+    values = np.asarray(values)
+    return values[~np.isnan(values)].astype(np.intp)
+
+
+def format_func(microseconds, pos):
+    '''
+    Formats a microsecond x value as a wall-clock tick label.
+
+    Matplotlib re-invokes the formatter for every tick on every pan/zoom;
+    the labels only have second granularity, so rounding down to the second
+    lets a small cache absorb the repeated datetime construction.
+
+    :param microseconds: The x value to format.
+    :param pos: The tick position (unused, required by FuncFormatter).
+    '''
+    return _format_seconds(int(microseconds // 1_000_000))
+
+
+def eda_plot(raw_chunks, analyzed_data):
+    '''
+    Plots the raw, phasic, and tonic components of an analyzed session.
+
+    The time axis of each subplot is the chunk's own timestamp array; it is
+    never rebuilt as a Python list per subplot, so matplotlib consumes the
+    float64 ndarray directly without per-element conversion.
+
+    :param raw_chunks: The pre-processed chunks of the session.
+    :param analyzed_data: The matching (signals, info) NeuroKit results.
+    '''
+    fig, (ax0, ax1, ax2) = plt.subplots(3, 1, sharex=True)
+    ax2.xaxis.set_major_formatter(FuncFormatter(format_func))
+
+    # label only the first chunk on each axes; matplotlib then has exactly
+    # one legend entry per series natively, instead of legend time spent
+    # walking every artist to deduplicate repeated labels afterwards
+    for i, chunk in enumerate(raw_chunks):
+        ax0.plot(chunk.ts, chunk.eda, color='tab:blue',
+                 label='Raw' if i == 0 else '_nolegend_')
+    ax0.set_ylabel('Raw EDA')
+    ax0.legend()
+
+    for i, (chunk, analyzed_chunk) in enumerate(zip(raw_chunks, analyzed_data)):
+        first = i == 0
+        # hoist the phasic column into an ndarray and clean each feature
+        # index array once per chunk, so the gathers below are C-level fancy
+        # indexing instead of repeated pandas column lookups and re-cleaning
+        # per scatter call
+        phasic = np.asarray(analyzed_chunk[0]['EDA_Phasic'])
+        info = analyzed_chunk[1]
+        onset_indices = _clean_indices(info['SCR_Onsets'])
+        peak_indices = _clean_indices(info['SCR_Peaks'])
+        half_recovery_indices = _clean_indices(info['SCR_Recovery'])
+
+        ax1.plot(chunk.ts, phasic, color='tab:orange',
+                 label='Phasic' if first else '_nolegend_')
+        ax1.scatter(chunk.ts[onset_indices], phasic[onset_indices],
+                    color='tab:red',
+                    label='SCR onset' if first else '_nolegend_')
+        ax1.scatter(chunk.ts[peak_indices], phasic[peak_indices],
+                    color='tab:green',
+                    label='SCR peak' if first else '_nolegend_')
+        ax1.scatter(chunk.ts[half_recovery_indices], phasic[half_recovery_indices],
+                    color='tab:purple',
+                    label='SCR half recovery' if first else '_nolegend_')
+    ax1.set_ylabel('Phasic')
+    ax1.legend()
+
+    for i, (chunk, analyzed_chunk) in enumerate(zip(raw_chunks, analyzed_data)):
+        ax2.plot(chunk.ts, analyzed_chunk[0]['EDA_Tonic'], color='tab:brown',
+                 label='Tonic' if i == 0 else '_nolegend_')
+    ax2.set_ylabel('Tonic')
+    ax2.legend()
+
+    return fig
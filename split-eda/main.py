@@ -0,0 +1,148 @@
+'''
+Entry point that renders the EDA figures for both annotation layouts.
+
+Loads the annotation JSON produced by convert.py plus the session
+recordings, narrows the recordings to each annotated region, and hands the
+results to eda_plot.
+'''
+
+import argparse
+import json
+import multiprocessing as mp
+
+import matplotlib.pyplot as plt
+import neurokit2 as nk
+import numpy as np
+import pandas as pd
+
+from eda import Eda
+from eda_common import TIMEZONE
+from eda_plot import eda_plot
+import make_plot
+
+
+def _analyze_chunks(raw_chunks):
+    '''
+    Runs nk.eda_process over the given chunks, in parallel when there are
+    several.
+
+    The chunks share no state and NeuroKit's filtering is CPU-bound, so a
+    process pool spreads them across cores; a lone chunk skips the pool to
+    avoid paying worker startup for nothing.
+
+    :param raw_chunks: The pre-processed chunks to analyze.
+    '''
+    if len(raw_chunks) <= 1:
+        return [
+            nk.eda_process(chunk.eda, sampling_rate=chunk.sampling_rate)
+            for chunk in raw_chunks
+        ]
+    with mp.Pool() as pool:
+        return pool.starmap(
+            nk.eda_process,
+            [(chunk.eda, chunk.sampling_rate) for chunk in raw_chunks],
+        )
+
+
+def _chunk_start_datetimes(raw_chunks):
+    '''
+    Converts every chunk's first sample time to a timezone-aware datetime
+    in one vectorized pass.
+
+    A timezone-aware fromtimestamp per chunk is pure-Python timezone work;
+    one pd.to_datetime call over the collected microsecond starts does the
+    whole batch in C and leaves only cheap indexing inside the loop.
+
+    :param raw_chunks: The pre-processed chunks of the raw trace.
+    '''
+    starts_us = np.fromiter(
+        (chunk.ts[0] for chunk in raw_chunks),
+        dtype=np.int64, count=len(raw_chunks),
+    )
+    return pd.to_datetime(starts_us, unit='us', utc=True).tz_convert(TIMEZONE)
+
+
+def detail(out: Eda):
+    '''
+    Renders one NeuroKit-style figure per chunk of the raw trace.
+
+    :param out: The loaded session recordings.
+    '''
+    starts = _chunk_start_datetimes(out.raw_chunks)
+    for i, (signals, info) in enumerate(out.analyzed_data):
+        make_plot.eda_plot(signals, info, starts[i].to_pydatetime(), [])
+        plt.show()
+
+
+def type_1(out: Eda, records: list[dict]):
+    '''
+    Renders one figure per region of the first annotation layout.
+
+    :param out: The loaded session recordings.
+    :param records: The annotation records from convert.py.
+    '''
+    for record in records:
+        kind = record['meta']['path']['kind']
+        slope_chunk = out.chunk(('*', kind, 's*'))
+        flat_chunk = out.chunk(('*', kind, 'f*'))
+
+        for region_chunk, name in ((slope_chunk, 'slope'), (flat_chunk, 'flat')):
+            # chunk.eda is already an ndarray straight from the parser; no
+            # per-row float() conversion happens on this path
+            analyzed = _analyze_chunks(region_chunk.raw_chunks)
+            fig = eda_plot(region_chunk.raw_chunks, analyzed)
+            bounds = region_chunk.get_min_max_timestamps()
+            fig.suptitle(f'{name}: {bounds[0]} - {bounds[1]}')
+            plt.show()
+
+
+def type_2(out: Eda, records: list[dict]):
+    '''
+    Renders one figure per trial of the second annotation layout.
+
+    The trial intervals nest inside the slope/flat regions, so the chunking
+    stacks: first narrow to the region, then to each trial within it.
+
+    :param out: The loaded session recordings.
+    :param records: The annotation records from convert.py.
+    '''
+    for record in records:
+        kind = record['meta']['path']['kind']
+        ground = record['meta']['path']['ground']
+        region_chunk = out.chunk(('*', kind, f'{ground[0]}*'))
+
+        for trial, (start, end) in enumerate(record['trials'], start=1):
+            if start is None or end is None:
+                continue
+            trial_chunk = region_chunk.chunk(('*', kind, f'{ground[0]}{trial}'))
+            analyzed = _analyze_chunks(trial_chunk.raw_chunks)
+            fig = eda_plot(trial_chunk.raw_chunks, analyzed)
+            bounds = trial_chunk.get_min_max_timestamps()
+            fig.suptitle(f'{ground} trial {trial}: {bounds[0]} - {bounds[1]}')
+            plt.show()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render the EDA figures for an annotation file.')
+    parser.add_argument('annotations', type=argparse.FileType('r'))
+    parser.add_argument('--format', type=int, choices=(1, 2), default=1,
+                        help='which annotation layout the file uses')
+    parser.add_argument('--detail', action='store_true',
+                        help='also render one figure per chunk of the raw trace')
+    args = parser.parse_args()
+
+    records = json.load(args.annotations)
+    out = Eda.from_dir(
+        './Data-Post-Processing',
+        './Data-Post-Processing/raw/eda.csv',
+    )
+    if args.detail:
+        detail(out)
+    if args.format == 1:
+        type_1(out, records)
+    else:
+        type_2(out, records)
+
+
+if __name__ == '__main__':
+    main()